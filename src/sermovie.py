@@ -22,9 +22,39 @@ from importlib.metadata import version
 __version__ = version(__name__)
 
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from enum import IntEnum
+from functools import cached_property
+import io
+import mmap
+import os
+import struct
 import warnings
 
+try:
+    import liburing  # optional, Linux only: batched reads in get_frames()
+except ImportError:
+    liburing = None
+
+
+class ColorMode(IntEnum):
+    """
+    Color modes of SER files, by ColorID.
+    """
+
+    MONO = 0
+    BAYER_RGGB = 8
+    BAYER_GRBG = 9
+    BAYER_GBRG = 10
+    BAYER_BGGR = 11
+    BAYER_CYYM = 16
+    BAYER_YCMY = 17
+    BAYER_YMCY = 18
+    BAYER_MYYC = 19
+    RGB = 100
+    BGR = 101
+
 
 class SERMovie:
     """
@@ -44,18 +74,21 @@ class SERMovie:
         print(m)  # Header info
 
         # For reading frames, some options:
-        # 1) Directly, outside context: get_frame() opens the file, reads
-        # one frame and automatically closes the file
+        # 1) get_frame() returns a read-only view of the frame from the
+        # memmap of the file (see option 3): the data is read by the OS
+        # on first access, and nothing is copied.
         im = m.get_frame(0)
         print(im.shape)
         plt.imshow(im)
 
-        # 2) Within context: the file is only opened at the beginning and
-        # closed at the end of the context. This is better than the
-        # previous option when accessing to multiple frames.
+        # 2) get_frame_copy() returns the frame as a new array. Outside
+        # context, it opens the file, reads one frame and automatically
+        # closes the file. Within context, the file is only opened at the
+        # beginning and closed at the end of the context, which is better
+        # when reading multiple frames.
         with m:
-            im0 = m.get_frame(0)
-            im1 = m.get_frame(1)
+            im0 = m.get_frame_copy(0)
+            im1 = m.get_frame_copy(1)
             plt.imshow(im1-im0)
 
         # 3) Access frames via memmap, so you can access all the stream
@@ -65,6 +98,18 @@ class SERMovie:
         print(ims.shape)
         plt.imshow(ims[0, ...])
 
+        # 4) Read a selection of frames into a new array. On Linux, with
+        # use_io_uring=True and liburing installed (pip install
+        # sermovie[uring]), large selections are read through io_uring,
+        # which is faster when the file is not in the page cache.
+        ims = m.get_frames([0, 10, 20])
+        print(ims.shape)
+
+        # 5) Bayer frames can be demosaiced to RGB (requires numba,
+        # pip install sermovie[numba])
+        rgb = m.get_frame_rgb(0)
+        plt.imshow(rgb)
+
 
     Attributes
     ----------
@@ -74,6 +119,13 @@ class SERMovie:
     color : str
         color mode of the current file (see color_modes)
 
+    color_mode : ColorMode
+        color mode of the current file, as an enum
+
+    bayer_red_position : dict
+        (row, column) of the red pixel in the 2x2 cell of the Bayer color
+        modes supported by get_frame_rgb()
+
     planes : int
         number of planes of each frame
 
@@ -117,12 +169,27 @@ class SERMovie:
 
     timestamps_utc : np.array[numpy.datetime64]
         numpy array including timestamps for all frames, if present
+        (read from the file on first access)
 
     Parameters
     ----------
     fname : str
         filename
 
+    use_odirect : bool
+        if True, get_frame_copy() and get_frames() read the file with
+        O_DIRECT, bypassing the OS page cache (useful for single pass reads
+        of very large files). Silently ignored where O_DIRECT is not
+        supported by the OS or the filesystem
+
+    use_io_uring : bool
+        if True (and liburing is installed), get_frames() submits the reads of
+        large non-contiguous selections (at least uring_min_frames frames) as
+        io_uring batches, so they are served concurrently by the device. This
+        pays off when the frames are not in the page cache; for cached files,
+        plain reads are faster. Silently ignored where io_uring is not
+        available, or together with O_DIRECT
+
     Raises
     ------
     NotImplementedError
@@ -131,48 +198,80 @@ class SERMovie:
 
     file_id = "LUCAM-RECORDER"
     header_size = 178
-    color_modes = {
-        0: "MONO",
-        8: "BAYER_RGGB",
-        9: "BAYER_GRBG",
-        10: "BAYER_GBRG",
-        11: "BAYER_BGGR",
-        16: "BAYER_CYYM",
-        17: "BAYER_YCMY",
-        18: "BAYER_YMCY",
-        19: "BAYER_MYYC",
-        100: "RGB",
-        101: "BGR",
+    # FileID, LuID, ColorID, LittleEndian, ImageWidth, ImageHeight,
+    # PixelDepthPerPlane, FrameCount, Observer, Instrument, Telescope,
+    # DateTime, DateTime_UTC
+    header_struct = struct.Struct("<14s7i40s40s40s2q")
+    # Reference date of SER timestamps, in their 100ns units (note: can't be created
+    # directly as np.datetime64(..., "100ns"), that overflows)
+    timestamp_ref = np.datetime64(datetime(1, 1, 1)).astype("datetime64[100ns]")
+    # io_uring (see use_io_uring): ring size, and minimum number of frames in a
+    # get_frames() call to use it (for fewer frames, plain reads are faster)
+    uring_queue_depth = 256
+    uring_min_frames = 16
+    # Minimum mean run length of consecutive frames for select() to copy runs as
+    # slices (for shorter runs, advanced indexing is faster)
+    select_min_run = 64
+    # Pixel dtype by (PixelDepthPerPlane, endian). Note that 16 bit data is read
+    # with the byte order opposite to the LittleEndian header flag
+    dtypes = {
+        (8, "little"): np.dtype("uint8"),
+        (8, "big"): np.dtype("uint8"),
+        (16, "little"): np.dtype(">u2"),
+        (16, "big"): np.dtype("<u2"),
+    }
+    # (row, column) of the red pixel within each 2x2 Bayer cell; blue is at the
+    # opposite corner
+    bayer_red_position = {
+        ColorMode.BAYER_RGGB: (0, 0),
+        ColorMode.BAYER_GRBG: (0, 1),
+        ColorMode.BAYER_GBRG: (1, 0),
+        ColorMode.BAYER_BGGR: (1, 1),
     }
+    color_modes = {mode.value: mode.name for mode in ColorMode}
 
-    def __init__(self, fname):
+    def __init__(self, fname, use_odirect=False, use_io_uring=False):
         self.fname = fname
-
-        read_int32 = lambda f: int.from_bytes(f.read(4), byteorder="little")
-        read_int64 = lambda f: int.from_bytes(f.read(8), byteorder="little")
-        read_str = lambda f, length: f.read(length).decode().strip()
-
-        with open(fname, "rb") as f:
-            file_id = read_str(f, 14)
+        self.use_odirect = use_odirect
+        self.use_io_uring = use_io_uring
+
+        # Unbuffered: the header is read at once, so a buffered reader would
+        # only add an extra copy (and read ahead into the image data)
+        with io.FileIO(fname, "rb") as f:
+            header = f.read(self.header_size)
+            if len(header) != self.header_size:
+                raise NotImplementedError("Incomplete header")
+            (
+                file_id,
+                self.lu_id,  # unused, 0
+                self.color_id,
+                little_endian,
+                self.width,
+                self.height,
+                self.bpp,
+                self.frames,
+                observer,
+                instrument,
+                telescope,
+                date_time,
+                date_time_utc,
+            ) = self.header_struct.unpack(header)
+
+            file_id = file_id.decode().strip()
             if file_id != self.file_id:
                 raise NotImplementedError(f"Unexpected FileID {file_id}")
-            self.lu_id = read_int32(f)  # unused, 0
 
-            self.color_id = read_int32(f)
-            self.color = self.color_modes[self.color_id]
-            self.planes = 3 if self.color in ("RGB", "BGR") else 1
+            try:
+                self.color_mode = ColorMode(self.color_id)
+            except ValueError:
+                raise NotImplementedError(f"Unexpected ColorID {self.color_id}")
+            self.color = self.color_mode.name
+            self.planes = 3 if self.color_mode in (ColorMode.RGB, ColorMode.BGR) else 1
 
-            self.endian = "little" if read_int32(f) else "big"
+            self.endian = "little" if little_endian else "big"
 
-            self.width = read_int32(f)
-            self.height = read_int32(f)
-            self.bpp = read_int32(f)
-            dtypes = {
-                8: "uint8",
-                16: ">u2" if self.endian == "little" else "<u2",
-            }
             try:
-                self.dtype = dtypes[self.bpp]
+                self.dtype = self.dtypes[(self.bpp, self.endian)]
             except KeyError:
                 raise NotImplementedError(f"Unexpected PixelDepthPerPlane {self.bpp}")
             self.shape = (
@@ -183,85 +282,483 @@ class SERMovie:
             self.frame_pixels = self.height * self.width
             self.frame_bytes = self.frame_pixels * self.planes * self.bpp // 8
 
-            self.frames = read_int32(f)
             data_size = self.frames * self.frame_bytes
-
-            self.observer = read_str(f, 40)
-            self.instrument = read_str(f, 40)
-            self.telescope = read_str(f, 40)
-            self.datetime = self.timestamp(np.array([read_int64(f)]))[0]
-            self.datetime_utc = self.timestamp(np.array([read_int64(f)]))[0]
-
-            assert (
-                f.tell() == self.header_size
-            ), f"Current position: {f.tell()}, expected header size: {self.header_size}"
-
-            f.seek(data_size, 1)  # Skip image data, jump to trailer (timestamps)
-            self.timestamps_utc = self.timestamp(np.fromfile(f, dtype="<i8"))
-            num_ts = self.timestamps_utc.shape[0]
-            if num_ts > 0 and num_ts != self.frames:
-                warnings.warn(
-                    f"Number of timestamps at trailer ({num_ts}) does not match the "
-                    f"number of frames specified in the header ({self.frames})"
-                )
-
-            self.f = None
+            self._trailer_offset = self.header_size + data_size
+
+            self.observer = observer.decode().strip()
+            self.instrument = instrument.decode().strip()
+            self.telescope = telescope.decode().strip()
+            # Scalar version of self.timestamp(), without 1-element arrays
+            self.datetime = (
+                self.timestamp_ref + np.timedelta64(date_time, "100ns")
+            ).astype("datetime64[us]")
+            self.datetime_utc = (
+                self.timestamp_ref + np.timedelta64(date_time_utc, "100ns")
+            ).astype("datetime64[us]")
+
+            self.fd = None
             self.mmap = None
+            self._direct = False
+            self._direct_buf = None
+            self._ring = None
+            self._use_ring = False
+
+    def _num_timestamps(self):
+        # Number of timestamps at the trailer, from the file size
+        return max(os.path.getsize(self.fname) - self._trailer_offset, 0) // 8
+
+    @cached_property
+    def timestamps_utc(self):
+        # The trailer is only read (through a temporary memmap) on first access
+        num_ts = self._num_timestamps()
+        if num_ts == 0:
+            return self.timestamp(np.empty(0, dtype="<i8"))
+        if num_ts != self.frames:
+            warnings.warn(
+                f"Number of timestamps at trailer ({num_ts}) does not match the "
+                f"number of frames specified in the header ({self.frames})"
+            )
+        trailer = np.memmap(
+            self.fname,
+            dtype="<i8",
+            mode="r",
+            offset=self._trailer_offset,
+            shape=(num_ts,),
+        )
+        return self.timestamp(trailer)
 
-    @staticmethod
-    def timestamp(tdelta64_100ns):
+    @classmethod
+    def timestamp(cls, tdelta64_100ns):
         # tdelta64_100ns: timestamps at the trailer of the .ser file are expressed in 100ns units
         # datetime support up to microsecond resolution; here we simply truncate the last digit
         # because we won't be working as such time resolution anyway.
         # This is a vectorized version of: timedelta(microseconds=tdelta64_100ns//10) + datetime(1, 1, 1)
+        # The raw int64 values are reinterpreted (not converted) as timedelta64[100ns], so the
+        # reference date is added in the file units and the truncation to us happens in the
+        # same pass as the final cast, without an intermediate integer division.
         # Note: numpy.datetime64 won't store timezone info, so it does makes sense to create the
         # reference date as datetime(1, 1, 1, tzinfo=timezone.utc)
-        ref = np.datetime64(datetime(1, 1, 1))
-        return (tdelta64_100ns // 10).astype("timedelta64[us]") + ref
+        tdelta = np.asarray(tdelta64_100ns).astype(np.int64, copy=False)
+        return (tdelta.view("timedelta64[100ns]") + cls.timestamp_ref).astype(
+            "datetime64[us]"
+        )
 
     def __enter__(self):
-        self.f = open(self.fname, "rb")
+        flags = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+        self._direct = False
+        if self.use_odirect and hasattr(os, "O_DIRECT"):
+            try:
+                self.fd = os.open(self.fname, flags | os.O_DIRECT)
+                self._direct = True
+            except OSError:  # e.g. tmpfs, fall back to cached reads
+                pass
+        if not self._direct:
+            self.fd = os.open(self.fname, flags)
+
+        # io_uring reads go straight into the (unaligned) output frames, so
+        # they can't be combined with O_DIRECT. The ring is only set up when
+        # first needed (see _get_ring())
+        self._use_ring = self.use_io_uring and liburing is not None and not self._direct
         return self
 
     def __exit__(self, exc_type, exc_value, exc_tb):
-        self.f.close()
-        self.f = None
+        self._close_ring()
+        self._direct_buf = None
+        os.close(self.fd)
+        self.fd = None
+
+    def _get_ring(self):
+        # The io_uring instance of the context, created on first use and kept
+        # until __exit__(), or None if io_uring is not used
+        if self._ring is None and self._use_ring:
+            ring = liburing.Ring()
+            try:
+                liburing.io_uring_queue_init(self.uring_queue_depth, ring)
+                self._ring = ring
+            except OSError:  # e.g. disabled in the kernel
+                self._use_ring = False
+        return self._ring
+
+    def _close_ring(self):
+        self._use_ring = False
+        if self._ring is not None:
+            liburing.io_uring_queue_exit(self._ring)
+            self._ring = None
+
+    def _pread(self, buf, offset):
+        if self._direct:
+            self._pread_direct(buf, offset)
+            return
+
+        # Reads buf.nbytes from offset straight into buf (no intermediate
+        # array, no seek when preadv is available). Large reads can be split
+        # by the OS, so keep reading until buf is full
+        buf_bytes = memoryview(buf).cast("B")
+        done = 0
+        while done < buf.nbytes:
+            if hasattr(os, "preadv"):
+                n = os.preadv(self.fd, [buf_bytes[done:]], offset + done)
+            else:  # e.g. Windows
+                os.lseek(self.fd, offset + done, os.SEEK_SET)
+                data = os.read(self.fd, buf.nbytes - done)
+                n = len(data)
+                buf_bytes[done : done + n] = data
+            if n == 0:
+                raise ValueError(f"Unexpected end of file at offset {offset + done}")
+            done += n
+
+    def _pread_direct(self, buf, offset, align=4096, chunk_size=1 << 23):
+        # Same as _pread(), for an O_DIRECT fd: file offsets, sizes and memory
+        # must be aligned, so read whole aligned blocks (up to chunk_size
+        # bytes at a time) into an aligned scratch buffer and copy the
+        # requested bytes from there. The scratch buffer is only as large as
+        # needed, and kept until __exit__()
+        buf_bytes = memoryview(buf).cast("B")
+        span_end = -(-(offset + buf.nbytes) // align) * align
+        span = min(chunk_size, span_end - (offset - offset % align))
+        if self._direct_buf is None or self._direct_buf.size < span:
+            self._direct_buf = _aligned_empty(span, align)
+        scratch = memoryview(self._direct_buf)
+
+        done = 0
+        while done < buf.nbytes:
+            pos = offset + done
+            block_start = pos - pos % align
+            block_end = min(block_start + len(scratch), span_end)
+            n = os.preadv(self.fd, [scratch[: block_end - block_start]], block_start)
+            n = min(n - (pos - block_start), buf.nbytes - done)
+            if n <= 0:
+                raise ValueError(f"Unexpected end of file at offset {pos}")
+            skip = pos - block_start
+            buf_bytes[done : done + n] = scratch[skip : skip + n]
+            done += n
 
     def get_frame(self, frame):
-        if frame >= self.frames:
+        """
+        Returns the requested frame, with shape self.shape, as a read-only
+        view of the memmap returned by as_memmap().
+
+        No data is read until the frame is accessed; then the OS pages it in
+        (and reads ahead when frames are visited in order). Note that random
+        access to a file much larger than the available RAM can be slow,
+        especially on HDDs. Use get_frame_copy() to get an independent array.
+        """
+        if not -self.frames <= frame < self.frames:
             raise ValueError(
                 f"Requested frame ({frame}) out of range ({self.frames} frames)"
             )
 
+        return self.as_memmap()[frame]
+
+    def get_frame_copy(self, frame, out=None):
+        """
+        Reads the requested frame from the file into a new array, with shape
+        self.shape, or into `out` if given.
+
+        Passing the same `out` array when reading many frames avoids
+        allocating a new array for each one (note that it is overwritten on
+        each call).
+        """
+        if not -self.frames <= frame < self.frames:
+            raise ValueError(
+                f"Requested frame ({frame}) out of range ({self.frames} frames)"
+            )
+        if frame < 0:
+            frame += self.frames
+
         frame_start = self.header_size + frame * self.frame_bytes
+        img = self._output_array(out, self.shape)
 
-        no_context = self.f is None
+        no_context = self.fd is None
         if no_context:
             self.__enter__()
 
-        self.f.seek(frame_start)
-        img = np.fromfile(self.f, dtype=self.dtype, count=self.frame_pixels)
+        try:
+            self._pread(img, frame_start)
+        finally:
+            if no_context:
+                self.__exit__(None, None, None)
+
+        return img
+
+    def _output_array(self, out, shape):
+        # Returns out, checking it can be filled directly by _pread(), or
+        # allocates it if not given
+        if out is None:
+            return np.empty(shape, self.dtype)
+        if out.shape != shape or out.dtype != self.dtype or not out.flags.c_contiguous:
+            raise ValueError(
+                f"Unexpected output array {out.shape} {out.dtype}, expected "
+                f"{shape} {self.dtype} (C-contiguous)"
+            )
+        return out
+
+    def get_frames(self, indices, out=None):
+        """
+        Returns the requested frames as a new array with shape
+        (number of frames,) + self.shape, or fills `out` if given.
+
+        `indices` can be a slice, a sequence of frame numbers (negative ones
+        count from the end) or a boolean mask of self.frames values. When they
+        select a contiguous range of frames (e.g. slice(100, 200)), all the
+        frames are read at once. Otherwise, frames are read one by one, or
+        submitted to the kernel in io_uring batches if enabled (see
+        use_io_uring) and at least uring_min_frames frames are requested.
+        Within context, the same io_uring instance is reused across calls.
+        """
+        if isinstance(indices, slice):
+            indices = np.arange(*indices.indices(self.frames))
+        indices = np.asarray(indices).reshape(-1)
+        if indices.dtype.kind == "b":
+            if indices.size != self.frames:
+                raise IndexError(
+                    f"Boolean mask of {indices.size} frames, expected {self.frames}"
+                )
+            indices = np.flatnonzero(indices)
+        elif indices.dtype.kind in "iu" or indices.size == 0:
+            indices = indices.astype(np.int64)
+            if indices.size and (
+                indices.min() < -self.frames or indices.max() >= self.frames
+            ):
+                raise ValueError(
+                    f"Requested frames out of range ({self.frames} frames)"
+                )
+            indices[indices < 0] += self.frames
+        else:
+            raise IndexError(
+                f"Frame numbers must be integers or a boolean mask, not {indices.dtype}"
+            )
+
+        out = self._output_array(out, (indices.size,) + self.shape)
+
+        if indices.size == 0:
+            return out
+
+        offsets = self.header_size + indices * self.frame_bytes
 
+        no_context = self.fd is None
         if no_context:
-            self.__exit__(None, None, None)
+            self.__enter__()
+
+        try:
+            if indices.size > 1 and np.all(np.diff(indices) == 1):
+                self._pread(out, int(offsets[0]))
+            elif indices.size >= self.uring_min_frames and self._get_ring() is not None:
+                self._uring_read(out, offsets)
+            else:
+                for i, offset in enumerate(offsets):
+                    self._pread(out[i], int(offset))
+        finally:
+            if no_context:
+                self.__exit__(None, None, None)
+
+        return out
+
+    def _uring_read(self, out, offsets):
+        # Reads each frame of out from the corresponding offset through the
+        # ring of the context (see _get_ring()), submitting up to
+        # uring_queue_depth reads at once
+        ring, queue_depth = self._ring, self.uring_queue_depth
+        cqe = liburing.Cqe()
+        out_bytes = memoryview(out).cast("B")
+        try:
+            for start in range(0, len(offsets), queue_depth):
+                batch = offsets[start : start + queue_depth]
+                iovecs = []  # keep them alive until completion
+                for i, offset in enumerate(batch, start):
+                    frame_bytes = out_bytes[
+                        i * self.frame_bytes : (i + 1) * self.frame_bytes
+                    ]
+                    iovecs.append(liburing.Iovec([frame_bytes]))
+                    sqe = liburing.io_uring_get_sqe(ring)
+                    liburing.io_uring_prep_readv(sqe, self.fd, iovecs[-1], int(offset))
+                    liburing.io_uring_sqe_set_data64(sqe, i)
+                liburing.io_uring_submit(ring)
+
+                # One completion at a time: cqe[j] doesn't wrap around the end
+                # of the completion ring, so entries can't be read in bulk
+                for _ in range(len(batch)):
+                    liburing.io_uring_wait_cqe(ring, cqe)
+                    res = cqe[0].res
+                    i = liburing.io_uring_cqe_get_data64(cqe[0])
+                    liburing.io_uring_cqe_seen(ring, cqe[0])
+                    if res < 0:
+                        raise OSError(-res, os.strerror(-res))
+                    if res != self.frame_bytes:
+                        # Short read (or end of file): read the rest as usual
+                        frame_end = (i + 1) * self.frame_bytes
+                        self._pread(
+                            out_bytes[frame_end - self.frame_bytes + res : frame_end],
+                            int(offsets[i]) + res,
+                        )
+        except BaseException:
+            # Reads may still be in flight (or completions unseen): drop the
+            # ring, following calls in this context will use plain reads
+            self._close_ring()
+            raise
+
+    def get_frame_rgb(self, frame):
+        """
+        Returns the requested frame as a new RGB array, with shape
+        (height, width, 3).
+
+        Bayer frames (RGGB, GRBG, GBRG, BGGR) are demosaiced with bilinear
+        interpolation by a compiled kernel, which requires numba. RGB and BGR
+        frames are returned in RGB order. The result is always in native byte
+        order.
+        """
+        native = self.dtype.newbyteorder("=")
+        if self.color_mode == ColorMode.RGB:
+            return self.get_frame_copy(frame).astype(native, copy=False)
+        if self.color_mode == ColorMode.BGR:
+            return self.get_frame_copy(frame)[..., ::-1].astype(native)
+        if self.color_mode not in self.bayer_red_position:
+            raise NotImplementedError(f"Unsupported color mode {self.color} for RGB")
+        if self.height < 2 or self.width < 2:
+            raise ValueError(
+                f"Bayer frames of {self.width}x{self.height} are too small to debayer"
+            )
 
-        return img.reshape(self.shape)
+        # numba requires native byte order
+        src = self.get_frame(frame).astype(native)
+        dst = np.empty(self.shape + (3,), src.dtype)
+        _debayer_kernel()(src, dst, *self.bayer_red_position[self.color_mode])
+        return dst
 
     def as_memmap(self):
         if self.mmap is None:
             self.mmap = np.memmap(
                 self.fname,
                 self.dtype,
+                mode="r",
                 offset=self.header_size,
                 shape=(self.frames,) + self.shape,
             )
         return self.mmap
 
+    def map_frames(self, func, frames=None, workers=None):
+        """
+        Returns the list of func(frame) for the requested frames (a slice or
+        a sequence of frame numbers, all of them by default), where frame is
+        a view from as_memmap().
+
+        func is called from a pool of `workers` threads (see
+        concurrent.futures.ThreadPoolExecutor for the default). NumPy and the
+        OS page fault handling release the GIL, so several frames are read
+        from disk at the same time, which keeps fast drives busy.
+        """
+        mm = self.as_memmap()
+        if frames is None:
+            frames = range(self.frames)
+        elif isinstance(frames, slice):
+            frames = range(*frames.indices(self.frames))
+
+        with ThreadPoolExecutor(workers) as executor:
+            return list(executor.map(lambda frame: func(mm[frame]), frames))
+
+    def advise(self, pattern="sequential"):
+        """
+        Tells the OS how the memmap returned by as_memmap() (and so
+        get_frame()) is going to be accessed, so it can adapt its readahead:
+        'sequential', 'random', 'willneed' (read it ahead now) or 'normal'.
+
+        Does nothing where madvise() is not available (e.g. Windows).
+        """
+        advices = {
+            "normal": "MADV_NORMAL",
+            "sequential": "MADV_SEQUENTIAL",
+            "random": "MADV_RANDOM",
+            "willneed": "MADV_WILLNEED",
+        }
+        if pattern not in advices:
+            raise ValueError(
+                f"Unexpected access pattern '{pattern}', expected one of {list(advices)}"
+            )
+
+        mm = self.as_memmap()
+        advice = getattr(mmap, advices[pattern], None)
+        if advice is not None and hasattr(mm._mmap, "madvise"):
+            mm._mmap.madvise(advice)
+
+    def select(self, sel):
+        """
+        Returns the frames selected by `sel`, the same as as_memmap()[sel]:
+        a new array for a boolean mask or an array of frame numbers, or a
+        view of the memmap for a slice or a single frame.
+
+        Each frame is already a contiguous block of the file, so advanced
+        indexing copies it in one go. Only when the selection is made of long
+        runs of consecutive frames (at least select_min_run frames on average)
+        each run is copied as a slice of the memmap instead, saving the
+        per-frame overhead. The order of the selection is preserved.
+        """
+        mm = self.as_memmap()
+        sel_array = None if isinstance(sel, slice) else np.asarray(sel)
+        if (
+            sel_array is None
+            or sel_array.ndim != 1
+            or sel_array.dtype.kind not in "biu"
+        ):
+            return mm[sel]
+
+        if sel_array.dtype.kind == "b":
+            if sel_array.shape[0] != self.frames:
+                raise IndexError(
+                    f"Boolean mask of {sel_array.shape[0]} frames, expected {self.frames}"
+                )
+            indices = np.flatnonzero(sel_array)
+        else:
+            indices = sel_array.astype(np.int64)
+            if indices.size and (
+                indices.min() < -self.frames or indices.max() >= self.frames
+            ):
+                raise IndexError(f"Selected frames out of range ({self.frames} frames)")
+            indices[indices < 0] += self.frames
+
+        breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+        if indices.size < self.select_min_run * (breaks.size + 1):
+            return mm[indices]
+
+        out = np.empty((indices.size,) + self.shape, self.dtype)
+        run_starts = indices[np.r_[0, breaks]]
+        run_lengths = np.diff(np.r_[0, breaks, indices.size])
+        pos = 0
+        for start, length in zip(run_starts.tolist(), run_lengths.tolist()):
+            out[pos : pos + length] = mm[start : start + length]
+            pos += length
+        return out
+
+    def preview_memmap(self):
+        """
+        Returns the same frames as as_memmap(), as 8 bit data.
+
+        For 16 bit files, this is a zero-copy view of the most significant
+        byte of each pixel, so reductions (mean, histograms, etc.) move half
+        the bytes. For 8 bit files, it is just as_memmap().
+        """
+        mm = self.as_memmap()
+        if self.bpp != 16:
+            return mm
+        # Note: byteorder is "=" for the native order, whatever it is
+        high_byte = 0 if mm.dtype == np.dtype(">u2") else 1
+        return mm.view(np.uint8).reshape(mm.shape + (2,))[..., high_byte]
+
+    def frames_view(self):
+        """
+        Returns a lightweight sequence of (timestamp, frame) records, where
+        the frame is a view from as_memmap() and the timestamp comes from
+        timestamps_utc (NaT for frames without a timestamp, e.g. if the file
+        has no trailer). Slices and index arrays are also supported.
+        """
+        return _FrameRecords(self)
+
     def close_memmap(self):
-        # TODO: can cause kernel crashes
-        #   https://github.com/numpy/numpy/issues/13510
-        if self.mmap is not None and not self.mmap._mmap.closed:
-            self.mmap._mmap.close()
+        # Only drops the reference: the OS unmaps the file once the memmap and
+        # every view taken from it (get_frame(), frames_view(), ...) are freed.
+        # Closing the underlying mmap while views are alive crashes the
+        # interpreter, see https://github.com/numpy/numpy/issues/13510
+        if self.mmap is not None:
+            self.mmap = None
         else:
             warnings.warn("Nothing to close")
 
@@ -273,8 +770,105 @@ class SERMovie:
             f"Observer: '{self.observer}'\n"
             f"Instrument: '{self.instrument}'\n"
             f"Telescope: '{self.instrument}'\n"
-            f"Frame Timestamps: {len(self.timestamps_utc)}\n"
+            f"Frame Timestamps: {self._num_timestamps()}\n"
         )
 
     def _repr_html_(self):
         return self.__str__().replace("\n", "<br/>")
+
+
+_debayer_bilinear = None
+
+
+def _debayer_kernel():
+    # Compiles the demosaicing kernel on first use, so that importing sermovie
+    # doesn't pay for importing numba
+    global _debayer_bilinear
+    if _debayer_bilinear is not None:
+        return _debayer_bilinear
+    try:
+        import numba  # optional: debayering in get_frame_rgb()
+    except ImportError:
+        raise ImportError("get_frame_rgb() requires numba") from None
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def debayer_bilinear(src, dst, red_row, red_col):
+        # Bilinear demosaicing of the Bayer mosaic src (H, W) into dst (H, W, 3),
+        # in a single pass. Borders are mirrored without repeating the edge pixel,
+        # which preserves the Bayer pattern
+        height, width = src.shape
+        for y in numba.prange(height):
+            yn = y - 1 if y > 0 else 1
+            ys = y + 1 if y < height - 1 else height - 2
+            is_red_row = (y & 1) == red_row
+            for x in range(width):
+                xw = x - 1 if x > 0 else 1
+                xe = x + 1 if x < width - 1 else width - 2
+                is_red_col = (x & 1) == red_col
+
+                c = int(src[y, x])
+                h_sum = int(src[y, xw]) + int(src[y, xe])
+                v_sum = int(src[yn, x]) + int(src[ys, x])
+                h, v = h_sum // 2, v_sum // 2
+                if is_red_row == is_red_col:  # red or blue pixel
+                    cross = (h_sum + v_sum) // 4
+                    diag = (
+                        int(src[yn, xw])
+                        + int(src[yn, xe])
+                        + int(src[ys, xw])
+                        + int(src[ys, xe])
+                    ) // 4
+                    if is_red_row:
+                        r, g, b = c, cross, diag
+                    else:
+                        r, g, b = diag, cross, c
+                elif is_red_row:  # green pixel in a red row
+                    r, g, b = h, c, v
+                else:  # green pixel in a blue row
+                    r, g, b = v, c, h
+
+                dst[y, x, 0] = r
+                dst[y, x, 1] = g
+                dst[y, x, 2] = b
+
+    _debayer_bilinear = debayer_bilinear
+    return _debayer_bilinear
+
+
+def _aligned_empty(size, align):
+    # Uninitialized uint8 array of the given size, starting at an align boundary
+    buf = np.empty(size + align, dtype=np.uint8)
+    offset = -buf.ctypes.data % align
+    return buf[offset : offset + size]
+
+
+class _FrameRecords:
+    # (timestamp, frame) records of a SERMovie, see SERMovie.frames_view()
+
+    def __init__(self, movie):
+        self.movie = movie
+        self._timestamps = None
+
+    def __len__(self):
+        return self.movie.frames
+
+    def __iter__(self):
+        for frame in range(len(self)):
+            yield self[frame]
+
+    def __getitem__(self, frame):
+        return self.timestamps[frame], self.movie.as_memmap()[frame]
+
+    @property
+    def timestamps(self):
+        # One timestamp per frame, padded with NaT if the trailer is missing or
+        # shorter than the number of frames
+        if self._timestamps is None:
+            ts = self.movie.timestamps_utc
+            if len(ts) != self.movie.frames:
+                padded = np.full(self.movie.frames, np.datetime64("NaT"), ts.dtype)
+                n = min(len(ts), self.movie.frames)
+                padded[:n] = ts[:n]
+                ts = padded
+            self._timestamps = ts
+        return self._timestamps